@@ -3,116 +3,20 @@
 Simple script to add the Adam and Eve books using the table of contents info.
 """
 
-import os
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html as lxml_html
 from pathlib import Path
 
-def add_adam_eve_books():
-    """Add Adam and Eve books based on file ranges from table of contents."""
-    source_dir = Path('/home/otis/Documents/projects/christianresearch/sacred-texts')
-    output_dir = Path('/home/otis/Documents/projects/christianresearch/website')
-    
-    # Based on the table of contents we saw earlier:
-    # First Book of Adam and Eve starts at page 3 (around fbe005.htm)
-    # Second Book of Adam and Eve starts at page 60 (around fbe085.htm) 
-    # Secrets of Enoch starts at page 81 (around fbe106.htm)
-    
-    # Let's use file number ranges
-    first_adam_files = [f"fbe{str(i).zfill(3)}.htm" for i in range(5, 85)]  # fbe005 to fbe084
-    second_adam_files = [f"fbe{str(i).zfill(3)}.htm" for i in range(85, 106)]  # fbe085 to fbe105
-    
-    # Filter to only existing files
-    all_files = [f for f in os.listdir(source_dir) if f.endswith('.htm')]
-    
-    first_adam_files = [f for f in first_adam_files if f in all_files]
-    second_adam_files = [f for f in second_adam_files if f in all_files]
-    
-    print(f"First Book files: {len(first_adam_files)} files ({first_adam_files[0]} to {first_adam_files[-1]})")
-    print(f"Second Book files: {len(second_adam_files)} files ({second_adam_files[0]} to {second_adam_files[-1]})")
-    
-    # Create the books
-    create_book("first_book_adam_eve", "The First Book of Adam and Eve", first_adam_files, source_dir, output_dir)
-    create_book("second_book_adam_eve", "The Second Book of Adam and Eve", second_adam_files, source_dir, output_dir)
-    
-    print("✅ Added Adam and Eve books to the website!")
-
-def create_book(book_id, book_title, files, source_dir, output_dir):
-    """Create a book page."""
-    chapters = []
-    
-    for filename in files:
-        try:
-            with open(source_dir / filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            title, clean_html = extract_clean_content(content)
-            
-            if title and clean_html.strip():
-                chapters.append({
-                    'filename': filename,
-                    'title': title,
-                    'content': clean_html
-                })
-                
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
-    
-    if chapters:
-        create_book_html(book_id, book_title, chapters, output_dir)
-        print(f"✅ Created {book_title} with {len(chapters)} chapters")
-    else:
-        print(f"❌ No chapters found for {book_title}")
+# Parser and queries used while cleaning a page; built once instead of per file
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+_OG_TITLE = etree.XPath('string(//meta[@property="og:title"]/@content)')
+_DROP_TAGS = frozenset({'script', 'nav', 'style', 'hr'})
+_CENTER_HEADINGS = frozenset({'h1', 'h2', 'h3'})
+# div is not a content tag: wrapper divs would serialize their p/h* children twice
+_CONTENT_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote'})
 
-def extract_clean_content(html_content):
-    """Extract clean content from HTML."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Get title from meta tag
-    title = ""
-    og_title = soup.find('meta', property='og:title')
-    if og_title and og_title.get('content'):
-        content_val = og_title.get('content')
-        if isinstance(content_val, list):
-            content_val = content_val[0] if content_val else ""
-        title = str(content_val).replace(' | Sacred Texts Archive', '')
-    
-    # Find body content
-    body = soup.find('body')
-    if not body:
-        return "", ""
-    
-    # Remove navigation elements
-    for element in body.find_all(['script', 'nav', 'style']):
-        element.decompose()
-    
-    # Remove navigation centers and hrs
-    for element in body.find_all(['center', 'hr']):
-        if element.name == 'center':
-            # Keep centers with actual content
-            has_content = (element.find('h1') or element.find('h2') or element.find('h3') or 
-                          (element.find('p') and len(element.get_text().strip()) > 50))
-            if not has_content:
-                element.decompose()
-        else:
-            element.decompose()
-    
-    # Extract main content
-    content_html = ""
-    for element in body.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'div']):
-        text = element.get_text().strip()
-        if text and len(text) > 10:  # Only include substantial content
-            # Clean up the element
-            for sub in element.find_all(['a']):
-                if 'href' in sub.attrs:
-                    del sub.attrs['href']
-            content_html += str(element) + "\n"
-    
-    return title, content_html
-
-def create_book_html(book_id, book_title, chapters, output_dir):
-    """Create the HTML page for a book."""
-    
-    html_content = f'''<!DOCTYPE html>
+# Static parts of the book page; only the header has substitutions
+_HEADER_TMPL = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -144,30 +48,15 @@ def create_book_html(book_id, book_title, chapters, output_dir):
                 <div class="chapter-nav">
                     <select id="chapterSelect" class="chapter-select">
                         <option value="">Select Chapter...</option>'''
-    
-    # Add chapter navigation
-    for i, chapter in enumerate(chapters[:20]):  # Limit to first 20 for dropdown
-        short_title = chapter['title'].replace('The Forgotten Books of Eden: ', '').replace(book_title + ': ', '')
-        if len(short_title) > 50:
-            short_title = short_title[:47] + "..."
-        html_content += f'<option value="#{chapter["filename"]}">{short_title}</option>'
-    
-    html_content += '''
+
+_CHAPTERS_OPEN = '''
                     </select>
                     <a href="../index.html" class="btn">← Back to Collection</a>
                 </div>
 
                 <div class="chapter-content">'''
-    
-    # Add all chapters
-    for chapter in chapters:
-        html_content += f'''
-                    <div id="{chapter['filename']}" class="chapter">
-                        {chapter['content']}
-                    </div>
-                    <hr style="margin: 3rem 0; border: none; border-top: 1px solid #eee;">'''
-    
-    html_content += '''
+
+_FOOTER = '''
                 </div>
             </div>
         </div>
@@ -183,9 +72,149 @@ def create_book_html(book_id, book_title, chapters, output_dir):
     <script src="../js/script.js"></script>
 </body>
 </html>'''
+
+# Per-chapter fragments of the book page
+_OPTION_TMPL = '<option value="#{fn}">{title}</option>'
+_CHAPTER_TMPL = '''
+                    <div id="{fn}" class="chapter">
+                        {body}
+                    </div>
+                    <hr style="margin: 3rem 0; border: none; border-top: 1px solid #eee;">'''
+
+def add_adam_eve_books():
+    """Add Adam and Eve books based on file ranges from table of contents."""
+    source_dir = Path('/home/otis/Documents/projects/christianresearch/sacred-texts')
+    output_dir = Path('/home/otis/Documents/projects/christianresearch/website')
+    
+    # Based on the table of contents we saw earlier:
+    # First Book of Adam and Eve starts at page 3 (around fbe005.htm)
+    # Second Book of Adam and Eve starts at page 60 (around fbe085.htm) 
+    # Secrets of Enoch starts at page 81 (around fbe106.htm)
+    
+    # Let's use file number ranges, bucketing the existing files in one pass
+    first_adam_files = []  # fbe005 to fbe084
+    second_adam_files = []  # fbe085 to fbe105
+    for p in source_dir.iterdir():
+        name = p.name
+        if not (name.startswith('fbe') and name[3:6].isdigit() and name[6:] == '.htm'):
+            continue
+        n = int(name[3:6])
+        if 5 <= n < 85:
+            first_adam_files.append(name)
+        elif 85 <= n < 106:
+            second_adam_files.append(name)
+    
+    first_adam_files.sort()
+    second_adam_files.sort()
+    
+    print(f"First Book files: {len(first_adam_files)} files ({first_adam_files[0]} to {first_adam_files[-1]})")
+    print(f"Second Book files: {len(second_adam_files)} files ({second_adam_files[0]} to {second_adam_files[-1]})")
+    
+    # Create the books
+    create_book("first_book_adam_eve", "The First Book of Adam and Eve", first_adam_files, source_dir, output_dir)
+    create_book("second_book_adam_eve", "The Second Book of Adam and Eve", second_adam_files, source_dir, output_dir)
+    
+    print("✅ Added Adam and Eve books to the website!")
+
+def create_book(book_id, book_title, files, source_dir, output_dir):
+    """Create a book page."""
+    chapters = []
+    
+    # Parsing is CPU-bound and independent per file, so fan it out across
+    # processes; map() keeps the results in chapter order
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_parse_one, [source_dir / f for f in files], chunksize=4)
+        for filename, (title, clean_html) in zip(files, results):
+            if title and clean_html.strip():
+                chapters.append({
+                    'filename': filename,
+                    'title': title,
+                    'content': clean_html
+                })
+    
+    if chapters:
+        create_book_html(book_id, book_title, chapters, output_dir)
+        print(f"✅ Created {book_title} with {len(chapters)} chapters")
+    else:
+        print(f"❌ No chapters found for {book_title}")
+
+def _parse_one(path):
+    """Read and clean a single source file; runs in a worker process."""
+    # Candidates come from the directory listing, so the read is expected to
+    # succeed; only parse failures are reported and skipped
+    content = path.read_bytes()
+    try:
+        return extract_clean_content(content)
+    except etree.ParserError as e:
+        print(f"Error processing {path.name}: {e}")
+        return "", ""
+
+def extract_clean_content(html_content):
+    """Extract clean content from raw UTF-8 encoded HTML."""
+    tree = lxml_html.fromstring(html_content, parser=_HTML_PARSER)
+    
+    # Get title from meta tag
+    title = _OG_TITLE(tree).replace(' | Sacred Texts Archive', '')
+    
+    # Find body content
+    body = tree.find('body')
+    if body is None:
+        return "", ""
+    
+    # Remove navigation elements and hrs, keeping any text that follows them
+    etree.strip_elements(body, *_DROP_TAGS, with_tail=False)
+    
+    # Remove navigation centers, keeping centers with actual content
+    for element in list(body.iter('center')):
+        has_content = (next(element.iter(*_CENTER_HEADINGS), None) is not None or 
+                      (next(element.iter('p'), None) is not None and _text_length(element) > 50))
+        if not has_content:
+            element.drop_tree()
+    
+    # Strip link targets once for the whole body
+    for element in body.iter('a'):
+        element.attrib.pop('href', None)
+    
+    # Extract main content
+    kept = [element for element in body.iter(*_CONTENT_TAGS)
+            if _text_length(element) > 10]  # Only include substantial content
+    
+    content_html = "".join(f"{lxml_html.tostring(element, encoding='unicode', with_tail=False)}\n"
+                           for element in kept)
+    
+    return title, content_html
+
+def _text_length(element):
+    """Length of an element's text with each text node trimmed, like get_text(strip=True)."""
+    return sum(len(text.strip()) for text in element.itertext())
+
+def _short_title(title, book_prefix):
+    """Trim the collection and book prefixes off a chapter title for the dropdown."""
+    title = title.removeprefix('The Forgotten Books of Eden: ').removeprefix(book_prefix)
+    return title if len(title) <= 50 else title[:47] + "..."
+
+def create_book_html(book_id, book_title, chapters, output_dir):
+    """Create the HTML page for a book."""
     
-    with open(output_dir / 'books' / f'{book_id}.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    book_prefix = book_title + ': '
+    
+    # Stream the page straight to disk so only one chapter string is live at a
+    # time; the 1 MB buffer keeps the number of write calls small
+    with open(output_dir / 'books' / f'{book_id}.html', 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(_HEADER_TMPL.format(book_title=book_title))
+        
+        # Add chapter navigation, limited to the first 20 for the dropdown
+        for chapter in chapters[:20]:
+            f.write(_OPTION_TMPL.format(fn=chapter['filename'],
+                                        title=_short_title(chapter['title'], book_prefix)))
+        
+        f.write(_CHAPTERS_OPEN)
+        
+        # Add all chapters
+        for chapter in chapters:
+            f.write(_CHAPTER_TMPL.format(fn=chapter['filename'], body=chapter['content']))
+        
+        f.write(_FOOTER)
 
 if __name__ == "__main__":
     add_adam_eve_books()
\ No newline at end of file
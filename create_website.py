@@ -7,53 +7,254 @@ Creates a clean, modern, responsive website with proper book organization.
 import os
 import re
 import json
-from bs4 import BeautifulSoup
+import filecmp
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html as lxml_html
 from pathlib import Path
 
+# Title markers that open each book, in priority order
+_BOUNDARY_MARKERS = [
+    ('first book of adam', 'first_book_adam_eve'),
+    ('second book of adam', 'second_book_adam_eve'),
+    ('secrets of enoch', 'secrets_enoch'),
+    ('psalms of solomon', 'psalms_solomon'),
+    ('odes of solomon', 'odes_solomon'),
+    ('letter of aristeas', 'letter_aristeas'),
+    ('maccabees', 'fourth_maccabees'),
+    ('ahikar', 'story_ahikar'),
+    ('testament', 'testaments_patriarchs')
+]
+
+# Each alternative is a lookahead from the start of the title, so the first
+# book whose marker appears anywhere wins (as an if/elif chain would) and
+# lastgroup names the section
+_TITLE_CLASSIFIER = re.compile(
+    '|'.join(f'(?=.*{re.escape(marker)})(?P<{section}>)' for marker, section in _BOUNDARY_MARKERS),
+    re.DOTALL
+)
+
+# Static stylesheet and script copied into every generated site
+_TEMPLATES_DIR = Path(__file__).resolve().parent / 'templates'
+
+# Source pages are UTF-8; declaring it lets libxml2 decode the raw bytes
+# without a Python-level decode or encoding detection
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Tag-name sets used while cleaning a page; built once instead of per file
+_DROP_TAGS = frozenset({'script', 'nav', 'style', 'hr'})
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+# div is not a content tag: wrapper divs would serialize their p/h* children twice
+_CONTENT_TAGS = _HEADING_TAGS | {'p', 'blockquote'}
+# A center holding one of these is content rather than navigation
+_CENTER_CONTENT_TAGS = frozenset({'h1', 'h2', 'h3', 'p'})
+# Tags _sniff_title streams to reproduce extract_clean_content's title choice;
+# extract_clean_content only walks <body>, so <head> is skipped as well
+_SNIFF_TAGS = tuple(_HEADING_TAGS | _DROP_TAGS | {'p', 'center'})
+_SNIFF_SKIP_TAGS = tuple(_DROP_TAGS) + ('head',)
+
+# Card blurbs for the index page
+_BOOK_DESCRIPTIONS = {
+    'first_book_adam_eve': 'The story of Adam and Eve after their expulsion from Eden, including their trials, temptations, and the birth of Cain and Abel.',
+    'second_book_adam_eve': 'Continuation of the Adam and Eve narrative, covering the patriarchs who lived before the Flood.',
+    'secrets_enoch': 'The mystical journey of Enoch through the heavens and his revelations about divine mysteries.',
+    'psalms_solomon': 'A collection of eighteen psalms attributed to King Solomon, reflecting on righteousness and divine judgment.',
+    'odes_solomon': 'Forty-two mystical odes expressing deep spiritual truths and early Christian thought.',
+    'letter_aristeas': 'The account of how the Hebrew scriptures were translated into Greek (the Septuagint).',
+    'fourth_maccabees': 'A philosophical discourse on the supremacy of devout reason over the passions.',
+    'story_ahikar': 'The tale of Ahikar, a wise counselor, and his ungrateful nephew Nadan.',
+    'testaments_patriarchs': 'The final words and teachings of the twelve sons of Jacob to their descendants.'
+}
+
+# Repeated fragments of the generated pages
+_BOOK_CARD_TMPL = '''
+                    <div class="book-card">
+                        <h2>{title}</h2>
+                        <p>{description}</p>
+                        <p><strong>{chapter_count} chapters</strong></p>
+                        <a href="books/{book_id}.html" class="btn">Read Now</a>
+                    </div>'''
+_NAV_LINK_TMPL = '<li><a href="{book_id}.html">{title}</a></li>'
+_OPTION_TMPL = '<option value="#{filename}">{title}</option>'
+_CHAPTER_OPEN_TMPL = '''
+                    <div id="{filename}" class="chapter">
+                        '''
+_CHAPTER_CLOSE = b'''
+                    </div>'''
+
+def _drop_element(element):
+    """Remove element and its subtree from the tree, keeping its tail text."""
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
+def _sniff_title(path):
+    """Pick a page's title from its headings the way extract_clean_content does."""
+    # Only headings are needed to classify a page, so stream the parse and
+    # stop at the first usable one instead of building the whole tree.
+    # Dropped subtrees and centers without an h1/h2/h3/p are removed as they
+    # close, taking their headings with them, so a heading's text is taken
+    # from what extract_clean_content would keep. Headings claim their place
+    # in document order when they open and get their text when they close
+    candidates = []
+    open_headings = []
+    open_centers = []
+    checked = 0
+    for event, element in etree.iterparse(path, events=('start', 'end'), tag=_SNIFF_TAGS,
+                                          html=True, encoding='utf-8'):
+        if next(element.iterancestors(*_SNIFF_SKIP_TAGS), None) is not None:
+            continue
+        
+        tag = element.tag
+        if tag in _DROP_TAGS:
+            if event == 'end':
+                _drop_element(element)
+            continue
+        
+        if tag == 'center':
+            if event == 'start':
+                open_centers.append([len(candidates), False])
+            else:
+                first_candidate, has_content = open_centers.pop()
+                if not has_content:
+                    del candidates[first_candidate:]
+                    _drop_element(element)
+        elif event == 'start':
+            if tag in _CENTER_CONTENT_TAGS:
+                for center in open_centers:
+                    center[1] = True
+            if tag in _HEADING_TAGS:
+                open_headings.append(len(candidates))
+                candidates.append(None)
+        else:
+            if tag in _HEADING_TAGS:
+                candidates[open_headings.pop()] = ''.join(element.itertext()).strip()
+            # Text inside an open heading is still needed for its title
+            if next(element.iterancestors(*_HEADING_TAGS), None) is None:
+                element.clear(keep_tail=True)
+        
+        # Candidates inside a center that may still be dropped, or still
+        # waiting for their text, are not final yet
+        settled = min((first for first, has_content in open_centers if not has_content), default=len(candidates))
+        while checked < settled and candidates[checked] is not None:
+            title = candidates[checked]
+            if title and not title.lower().startswith('the forgotten books'):
+                return title
+            checked += 1
+    
+    # No usable heading: like extract_clean_content, settle for the last one
+    return candidates[-1] if candidates else ""
+
+def _parse_file(filename, path):
+    """Read and clean one source file in a worker process."""
+    try:
+        return filename, BookParser.extract_clean_content(path)
+        
+    except Exception:
+        # Left uncached so the serial pass retries the file and reports the error
+        return filename, None
+
 class BookParser:
     def __init__(self, source_dir, output_dir):
         self.source_dir = Path(source_dir)
         self.output_dir = Path(output_dir)
         self.books = {}
         self.chapters = {}
+        self._parsed_cache = {}
+        self._books_out = os.path.join(self.output_dir, 'books')
         
-    def extract_clean_content(self, html_content):
-        """Extract clean, readable content from HTML."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def parse_file(self, filename):
+        """Read and clean a source file, reusing the result of an earlier parse."""
+        if filename not in self._parsed_cache:
+            self._parsed_cache[filename] = self.extract_clean_content(self.source_dir / filename)
+        
+        return self._parsed_cache[filename]
+    
+    def parse_files(self, entries):
+        """Parse source files across worker processes and fill the parse cache."""
+        entries = [entry for entry in entries if entry.name not in self._parsed_cache]
+        names = [entry.name for entry in entries]
+        paths = [entry.path for entry in entries]
+        with ProcessPoolExecutor() as executor:
+            for filename, result in executor.map(_parse_file, names, paths, chunksize=8):
+                if result is not None:
+                    self._parsed_cache[filename] = result
+    
+    def list_source_files(self):
+        """List the book's source pages in reading order as os.DirEntry objects."""
+        with os.scandir(self.source_dir) as it:
+            entries = [e for e in it if e.name.endswith('.htm') and e.name.startswith('fbe')]
         
-        # Remove all navigation, scripts, and metadata
-        for element in soup.find_all(['script', 'nav', 'style', 'head']):
-            element.decompose()
+        entries.sort(key=lambda e: e.name)
+        return entries
+    
+    @staticmethod
+    def extract_clean_content(source):
+        """Extract the title and clean, readable content (as UTF-8 bytes) from an HTML file."""
+        # libxml2 reads the file itself, so the page never passes through a
+        # Python bytes buffer
+        tree = lxml_html.parse(source, parser=_HTML_PARSER).getroot()
         
         # Find the main content body
-        body = soup.find('body')
-        if not body:
-            return "", ""
-        
-        # Remove navigation elements but keep content
-        for nav_element in body.find_all(['center', 'hr']):
-            # Keep center elements that contain actual content (headings, paragraphs)
-            if nav_element.name == 'center' and not (nav_element.find('h1') or nav_element.find('h2') or nav_element.find('h3') or nav_element.find('p')):
-                nav_element.decompose()
-            elif nav_element.name == 'hr':
-                nav_element.decompose()
+        body = tree.find('body') if tree is not None else None
+        if body is None:
+            return "", b""
+        
+        # Sort the body into buckets in a single walk. Removed subtrees are
+        # skipped, and a center is dropped unless a heading or paragraph was
+        # seen inside it, discarding any candidates collected within it
+        dropped = []
+        candidates = []
+        open_centers = []
+        walker = etree.iterwalk(body, events=('start', 'end'))
+        for event, element in walker:
+            tag = element.tag
+            if event == 'end':
+                if tag == 'center':
+                    center, first_candidate, has_content = open_centers.pop()
+                    if not has_content:
+                        dropped.append(center)
+                        del candidates[first_candidate:]
+            elif tag in _DROP_TAGS:
+                dropped.append(element)
+                walker.skip_subtree()
+            elif tag == 'center':
+                open_centers.append([element, len(candidates), False])
+            elif tag in _CONTENT_TAGS:
+                candidates.append(element)
+                if tag in _CENTER_CONTENT_TAGS:
+                    for center in open_centers:
+                        center[2] = True
+        
+        # Remove navigation, scripts and empty centers, keeping any text that follows them
+        for element in dropped:
+            element.drop_tree()
         
         # Extract title from first heading
         title = ""
-        for heading in body.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            title = heading.get_text().strip()
+        for heading in candidates:
+            if heading.tag not in _HEADING_TAGS:
+                continue
+            title = heading.text_content().strip()
             if title and not title.lower().startswith('the forgotten books'):
                 break
         
-        # Convert to clean text while preserving structure
-        content_html = ""
-        for element in body.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'blockquote']):
-            if element.get_text().strip():
-                content_html += str(element) + "\n"
+        # Convert to clean text while preserving structure, serialized straight
+        # to UTF-8 so the bytes can be written to the book page as they are
+        content_html = bytearray()
+        for element in candidates:
+            if element.text_content().strip():
+                content_html += lxml_html.tostring(element, encoding='utf-8', with_tail=False)
+                content_html += b"\n"
         
-        return title, content_html
+        return title, bytes(content_html)
     
-    def identify_book_sections(self):
+    def identify_book_sections(self, entries=None):
         """Identify the different books and their file ranges."""
         book_sections = {
             'title_pages': ['fbe000.htm', 'fbe001.htm', 'fbe002.htm', 'fbe003.htm', 'fbe004.htm'],
@@ -70,57 +271,48 @@ class BookParser:
         }
         
         # Based on the table of contents, determine file ranges
-        html_files = sorted([f for f in os.listdir(self.source_dir) if f.endswith('.htm') and f.startswith('fbe')])
+        if entries is None:
+            entries = self.list_source_files()
         
-        current_section = 'title_pages'
-        for filename in html_files:
+        # Mark the pages that open a book; the rest (None) continue the
+        # previous one
+        marks = []
+        for entry in entries:
+            filename = entry.name
             if filename in book_sections['title_pages'] or filename in book_sections['index_pages']:
                 continue
             
-            # Read file to determine which book section it belongs to
             try:
-                with open(self.source_dir / filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                title, _ = self.extract_clean_content(content)
-                title_lower = title.lower()
-                
-                if 'first book of adam' in title_lower:
-                    current_section = 'first_book_adam_eve'
-                elif 'second book of adam' in title_lower:
-                    current_section = 'second_book_adam_eve'
-                elif 'secrets of enoch' in title_lower or 'book of the secrets of enoch' in title_lower:
-                    current_section = 'secrets_enoch'
-                elif 'psalms of solomon' in title_lower:
-                    current_section = 'psalms_solomon'
-                elif 'odes of solomon' in title_lower:
-                    current_section = 'odes_solomon'
-                elif 'letter of aristeas' in title_lower:
-                    current_section = 'letter_aristeas'
-                elif 'fourth book of maccabees' in title_lower or 'maccabees' in title_lower:
-                    current_section = 'fourth_maccabees'
-                elif 'story of ahikar' in title_lower or 'ahikar' in title_lower:
-                    current_section = 'story_ahikar'
-                elif 'testament' in title_lower:
-                    current_section = 'testaments_patriarchs'
-                
-                book_sections[current_section].append(filename)
+                title = _sniff_title(entry.path)
+                match = _TITLE_CLASSIFIER.match(title.lower())
+                marks.append((filename, match.lastgroup if match else None))
                 
             except Exception as e:
                 print(f"Error processing {filename}: {e}")
         
+        # Carry each book forward until the next boundary page
+        current_section = 'title_pages'
+        for filename, section in marks:
+            current_section = section or current_section
+            book_sections[current_section].append(filename)
+        
         return book_sections
     
     def generate_modern_website(self):
         """Generate a complete modern website."""
-        # Create output directories
-        self.output_dir.mkdir(exist_ok=True)
-        (self.output_dir / 'css').mkdir(exist_ok=True)
-        (self.output_dir / 'js').mkdir(exist_ok=True)
-        (self.output_dir / 'books').mkdir(exist_ok=True)
+        # Create output directories; makedirs also creates output_dir itself
+        for subdir in ('css', 'js', 'books'):
+            os.makedirs(os.path.join(self.output_dir, subdir), exist_ok=True)
         
         # Get book sections
-        book_sections = self.identify_book_sections()
+        entries = self.list_source_files()
+        book_sections = self.identify_book_sections(entries)
+        
+        # Parse the pages that belong to a book up front in parallel; the
+        # sections below then read from the cache
+        book_files = {filename for section_name, files in book_sections.items()
+                      if section_name not in ['title_pages', 'index_pages'] for filename in files}
+        self.parse_files([entry for entry in entries if entry.name in book_files])
         
         # Process each book section
         books_data = {}
@@ -150,10 +342,7 @@ class BookParser:
         
         for filename in files:
             try:
-                with open(self.source_dir / filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                title, clean_html = self.extract_clean_content(content)
+                title, clean_html = self.parse_file(filename)
                 
                 if title and clean_html:
                     chapter = {
@@ -183,388 +372,25 @@ class BookParser:
         }
         return titles.get(section_name, section_name.replace('_', ' ').title())
     
+    def copy_if_changed(self, src, dst):
+        """Copy src to dst unless dst already holds exactly the same content."""
+        if dst.exists() and filecmp.cmp(src, dst, shallow=False):
+            return
+        
+        # copyfile uses the kernel's in-place copy (sendfile/copy_file_range) where available
+        shutil.copyfile(src, dst)
+    
     def create_css(self):
         """Create modern CSS stylesheet."""
-        css_content = '''
-/* Modern CSS for The Forgotten Books of Eden */
-:root {
-    --primary-color: #2c3e50;
-    --secondary-color: #34495e;
-    --accent-color: #e74c3c;
-    --background-color: #ecf0f1;
-    --text-color: #2c3e50;
-    --light-gray: #bdc3c7;
-    --white: #ffffff;
-    --font-size-base: 18px;
-    --line-height-base: 1.6;
-    --border-radius: 8px;
-    --shadow: 0 2px 10px rgba(0,0,0,0.1);
-}
-
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: 'Georgia', 'Times New Roman', serif;
-    font-size: var(--font-size-base);
-    line-height: var(--line-height-base);
-    color: var(--text-color);
-    background-color: var(--background-color);
-    margin: 0;
-    padding: 0;
-}
-
-.container {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 0 20px;
-}
-
-/* Header */
-.header {
-    background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-    color: var(--white);
-    padding: 2rem 0;
-    text-align: center;
-    box-shadow: var(--shadow);
-}
-
-.header h1 {
-    font-size: 2.5rem;
-    margin-bottom: 0.5rem;
-    font-weight: 300;
-}
-
-.header p {
-    font-size: 1.1rem;
-    opacity: 0.9;
-}
-
-/* Navigation */
-.nav {
-    background: var(--white);
-    padding: 1rem 0;
-    box-shadow: var(--shadow);
-    position: sticky;
-    top: 0;
-    z-index: 100;
-}
-
-.nav ul {
-    list-style: none;
-    display: flex;
-    justify-content: center;
-    flex-wrap: wrap;
-    gap: 2rem;
-}
-
-.nav a {
-    color: var(--primary-color);
-    text-decoration: none;
-    font-weight: 500;
-    padding: 0.5rem 1rem;
-    border-radius: var(--border-radius);
-    transition: all 0.3s ease;
-}
-
-.nav a:hover {
-    background-color: var(--primary-color);
-    color: var(--white);
-}
-
-/* Main Content */
-.main {
-    padding: 3rem 0;
-    min-height: 60vh;
-}
-
-/* Books Grid */
-.books-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-    gap: 2rem;
-    margin-top: 2rem;
-}
-
-.book-card {
-    background: var(--white);
-    padding: 2rem;
-    border-radius: var(--border-radius);
-    box-shadow: var(--shadow);
-    transition: transform 0.3s ease, box-shadow 0.3s ease;
-}
-
-.book-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 4px 20px rgba(0,0,0,0.15);
-}
-
-.book-card h2 {
-    color: var(--primary-color);
-    margin-bottom: 1rem;
-    font-size: 1.4rem;
-}
-
-.book-card p {
-    color: var(--secondary-color);
-    margin-bottom: 1.5rem;
-}
-
-.book-card .btn {
-    display: inline-block;
-    background: var(--accent-color);
-    color: var(--white);
-    padding: 0.75rem 1.5rem;
-    text-decoration: none;
-    border-radius: var(--border-radius);
-    font-weight: 500;
-    transition: background-color 0.3s ease;
-}
-
-.book-card .btn:hover {
-    background-color: #c0392b;
-}
-
-/* Reading Interface */
-.reading-container {
-    max-width: 800px;
-    margin: 0 auto;
-    background: var(--white);
-    padding: 3rem;
-    border-radius: var(--border-radius);
-    box-shadow: var(--shadow);
-}
-
-.chapter-nav {
-    background: var(--background-color);
-    padding: 1rem;
-    border-radius: var(--border-radius);
-    margin-bottom: 2rem;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    flex-wrap: wrap;
-    gap: 1rem;
-}
-
-.chapter-select {
-    padding: 0.5rem 1rem;
-    border: 2px solid var(--light-gray);
-    border-radius: var(--border-radius);
-    font-size: 1rem;
-    background: var(--white);
-}
-
-.chapter-nav .btn {
-    background: var(--primary-color);
-    color: var(--white);
-    padding: 0.5rem 1rem;
-    text-decoration: none;
-    border-radius: var(--border-radius);
-    font-size: 0.9rem;
-}
-
-.chapter-content h1, .chapter-content h2, .chapter-content h3 {
-    color: var(--primary-color);
-    margin: 2rem 0 1rem 0;
-    line-height: 1.3;
-}
-
-.chapter-content h1 {
-    font-size: 2rem;
-    text-align: center;
-    border-bottom: 2px solid var(--light-gray);
-    padding-bottom: 1rem;
-}
-
-.chapter-content h2 {
-    font-size: 1.5rem;
-}
-
-.chapter-content h3 {
-    font-size: 1.2rem;
-}
-
-.chapter-content p {
-    margin-bottom: 1.5rem;
-    text-align: justify;
-    text-indent: 1.5rem;
-}
-
-.chapter-content blockquote {
-    border-left: 4px solid var(--accent-color);
-    margin: 2rem 0;
-    padding: 1rem 2rem;
-    background: var(--background-color);
-    font-style: italic;
-}
-
-/* Search */
-.search-container {
-    text-align: center;
-    margin-bottom: 3rem;
-}
-
-.search-input {
-    width: 100%;
-    max-width: 500px;
-    padding: 1rem 1.5rem;
-    border: 2px solid var(--light-gray);
-    border-radius: var(--border-radius);
-    font-size: 1.1rem;
-    margin-bottom: 1rem;
-}
-
-.search-input:focus {
-    outline: none;
-    border-color: var(--primary-color);
-}
-
-/* Footer */
-.footer {
-    background: var(--primary-color);
-    color: var(--white);
-    text-align: center;
-    padding: 2rem 0;
-    margin-top: 3rem;
-}
-
-/* Responsive Design */
-@media (max-width: 768px) {
-    .header h1 {
-        font-size: 2rem;
-    }
-    
-    .nav ul {
-        flex-direction: column;
-        align-items: center;
-        gap: 1rem;
-    }
-    
-    .reading-container {
-        padding: 1.5rem;
-        margin: 0 1rem;
-    }
-    
-    .chapter-nav {
-        flex-direction: column;
-        text-align: center;
-    }
-    
-    .books-grid {
-        grid-template-columns: 1fr;
-    }
-    
-    .container {
-        padding: 0 15px;
-    }
-}
-
-/* Print Styles */
-@media print {
-    .nav, .chapter-nav, .footer {
-        display: none !important;
-    }
-    
-    .reading-container {
-        box-shadow: none;
-        padding: 0;
-    }
-    
-    .chapter-content {
-        font-size: 12pt;
-        line-height: 1.4;
-    }
-}
-'''
-        
-        with open(self.output_dir / 'css' / 'style.css', 'w', encoding='utf-8') as f:
-            f.write(css_content)
+        self.copy_if_changed(_TEMPLATES_DIR / 'style.css', self.output_dir / 'css' / 'style.css')
     
     def create_javascript(self):
         """Create JavaScript for enhanced functionality."""
-        js_content = '''
-// JavaScript for The Forgotten Books of Eden Website
-
-document.addEventListener('DOMContentLoaded', function() {
-    // Search functionality
-    const searchInput = document.getElementById('search');
-    if (searchInput) {
-        searchInput.addEventListener('input', function() {
-            const query = this.value.toLowerCase();
-            const bookCards = document.querySelectorAll('.book-card');
-            
-            bookCards.forEach(card => {
-                const title = card.querySelector('h2').textContent.toLowerCase();
-                const description = card.querySelector('p').textContent.toLowerCase();
-                
-                if (title.includes(query) || description.includes(query)) {
-                    card.style.display = 'block';
-                } else {
-                    card.style.display = 'none';
-                }
-            });
-        });
-    }
-    
-    // Chapter navigation
-    const chapterSelect = document.getElementById('chapterSelect');
-    if (chapterSelect) {
-        chapterSelect.addEventListener('change', function() {
-            const selectedChapter = this.value;
-            if (selectedChapter) {
-                window.location.href = selectedChapter;
-            }
-        });
-    }
-    
-    // Smooth scrolling for anchor links
-    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-        anchor.addEventListener('click', function (e) {
-            e.preventDefault();
-            const target = document.querySelector(this.getAttribute('href'));
-            if (target) {
-                target.scrollIntoView({
-                    behavior: 'smooth'
-                });
-            }
-        });
-    });
-    
-    // Reading progress indicator
-    const readingContainer = document.querySelector('.chapter-content');
-    if (readingContainer) {
-        const progressBar = document.createElement('div');
-        progressBar.style.cssText = `
-            position: fixed;
-            top: 0;
-            left: 0;
-            height: 3px;
-            background: #e74c3c;
-            z-index: 1000;
-            transition: width 0.1s ease;
-        `;
-        document.body.appendChild(progressBar);
-        
-        window.addEventListener('scroll', function() {
-            const scrollTop = window.pageYOffset;
-            const docHeight = document.body.offsetHeight - window.innerHeight;
-            const scrollPercent = (scrollTop / docHeight) * 100;
-            progressBar.style.width = scrollPercent + '%';
-        });
-    }
-});
-'''
-        
-        with open(self.output_dir / 'js' / 'script.js', 'w', encoding='utf-8') as f:
-            f.write(js_content)
+        self.copy_if_changed(_TEMPLATES_DIR / 'script.js', self.output_dir / 'js' / 'script.js')
     
     def create_index_page(self, books_data):
         """Create the main index page."""
-        html_content = '''<!DOCTYPE html>
+        parts = ['''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -610,34 +436,17 @@ document.addEventListener('DOMContentLoaded', function() {
 
             <section id="books">
                 <h2 style="text-align: center; margin-bottom: 2rem; color: var(--primary-color);">The Collection</h2>
-                <div class="books-grid">'''
+                <div class="books-grid">''']
         
         # Add book cards
-        book_descriptions = {
-            'first_book_adam_eve': 'The story of Adam and Eve after their expulsion from Eden, including their trials, temptations, and the birth of Cain and Abel.',
-            'second_book_adam_eve': 'Continuation of the Adam and Eve narrative, covering the patriarchs who lived before the Flood.',
-            'secrets_enoch': 'The mystical journey of Enoch through the heavens and his revelations about divine mysteries.',
-            'psalms_solomon': 'A collection of eighteen psalms attributed to King Solomon, reflecting on righteousness and divine judgment.',
-            'odes_solomon': 'Forty-two mystical odes expressing deep spiritual truths and early Christian thought.',
-            'letter_aristeas': 'The account of how the Hebrew scriptures were translated into Greek (the Septuagint).',
-            'fourth_maccabees': 'A philosophical discourse on the supremacy of devout reason over the passions.',
-            'story_ahikar': 'The tale of Ahikar, a wise counselor, and his ungrateful nephew Nadan.',
-            'testaments_patriarchs': 'The final words and teachings of the twelve sons of Jacob to their descendants.'
-        }
+        parts.append(''.join(_BOOK_CARD_TMPL.format_map({
+            'title': book_data['title'],
+            'description': _BOOK_DESCRIPTIONS.get(book_id, 'An important ancient text preserved in this collection.'),
+            'chapter_count': len(book_data['chapters']),
+            'book_id': book_id
+        }) for book_id, book_data in books_data.items()))
         
-        for book_id, book_data in books_data.items():
-            description = book_descriptions.get(book_id, 'An important ancient text preserved in this collection.')
-            chapter_count = len(book_data['chapters'])
-            
-            html_content += f'''
-                    <div class="book-card">
-                        <h2>{book_data['title']}</h2>
-                        <p>{description}</p>
-                        <p><strong>{chapter_count} chapters</strong></p>
-                        <a href="books/{book_id}.html" class="btn">Read Now</a>
-                    </div>'''
-        
-        html_content += '''
+        parts.append('''
                 </div>
             </section>
 
@@ -667,19 +476,24 @@ document.addEventListener('DOMContentLoaded', function() {
 
     <script src="js/script.js"></script>
 </body>
-</html>'''
+</html>''')
+        
+        html_content = ''.join(parts)
         
-        with open(self.output_dir / 'index.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        (self.output_dir / 'index.html').write_bytes(html_content.encode('utf-8'))
     
     def create_book_pages(self, books_data):
         """Create individual book reading pages."""
+        # Build the links to every book once; each page drops its own link
+        nav_links = ''.join(_NAV_LINK_TMPL.format_map({'book_id': book_id, 'title': book_data['title']})
+                            for book_id, book_data in books_data.items())
+        
         for book_id, book_data in books_data.items():
-            self.create_book_page(book_id, book_data, books_data)
+            self.create_book_page(book_id, book_data, nav_links)
     
-    def create_book_page(self, book_id, book_data, all_books):
+    def create_book_page(self, book_id, book_data, nav_links):
         """Create a single book reading page."""
-        html_content = f'''<!DOCTYPE html>
+        parts = [f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -700,14 +514,13 @@ document.addEventListener('DOMContentLoaded', function() {
         <div class="container">
             <ul>
                 <li><a href="../index.html">Home</a></li>
-                <li><a href="../index.html#books">All Books</a></li>'''
+                <li><a href="../index.html#books">All Books</a></li>''']
         
         # Add navigation to other books
-        for other_id, other_book in all_books.items():
-            if other_id != book_id:
-                html_content += f'<li><a href="{other_id}.html">{other_book["title"]}</a></li>'
+        self_link = _NAV_LINK_TMPL.format_map({'book_id': book_id, 'title': book_data['title']})
+        parts.append(nav_links.replace(self_link, ''))
         
-        html_content += '''
+        parts.append('''
             </ul>
         </div>
     </nav>
@@ -717,27 +530,31 @@ document.addEventListener('DOMContentLoaded', function() {
             <div class="reading-container">
                 <div class="chapter-nav">
                     <select id="chapterSelect" class="chapter-select">
-                        <option value="">Select Chapter...</option>'''
+                        <option value="">Select Chapter...</option>''')
         
         # Add chapter options
-        for i, chapter in enumerate(book_data['chapters']):
-            html_content += f'<option value="#{chapter["filename"]}">{chapter["title"]}</option>'
+        for chapter in book_data['chapters']:
+            parts.append(_OPTION_TMPL.format_map(chapter))
         
-        html_content += '''
+        parts.append('''
                     </select>
                     <a href="../index.html" class="btn">← Back to Collection</a>
                 </div>
 
-                <div class="chapter-content">'''
-        
-        # Add all chapters
-        for chapter in book_data['chapters']:
-            html_content += f'''
-                    <div id="{chapter['filename']}" class="chapter">
-                        {chapter['content']}
-                    </div>'''
+                <div class="chapter-content">''')
         
-        html_content += '''
+        # Stream the page to disk so only one chapter is handled at a time;
+        # chapter content is already UTF-8 bytes and is written as is
+        with open(os.path.join(self._books_out, f'{book_id}.html'), 'wb') as f:
+            f.write(''.join(parts).encode('utf-8'))
+            
+            # Add all chapters
+            for chapter in book_data['chapters']:
+                f.write(_CHAPTER_OPEN_TMPL.format_map(chapter).encode('utf-8'))
+                f.write(chapter['content'])
+                f.write(_CHAPTER_CLOSE)
+            
+            f.write(b'''
                 </div>
             </div>
         </div>
@@ -752,10 +569,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
     <script src="../js/script.js"></script>
 </body>
-</html>'''
-        
-        with open(self.output_dir / 'books' / f'{book_id}.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
+</html>''')
 
 if __name__ == "__main__":
     parser = BookParser(
@@ -3,49 +3,216 @@
 Improved book parser for The Forgotten Books of Eden - ensures all books are captured.
 """
 
+import gzip
+import hashlib
+import io
 import os
+import pickle
 import re
 import json
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html as lxml_html
 from pathlib import Path
 
+try:
+    import brotli
+except ImportError:
+    # Optional: without it pages only get a .gz companion
+    brotli = None
+
+# Source pages are UTF-8; read as bytes and decoded by libxml2
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+# Title lookups for the classification passes, compiled once and evaluated by libxml2
+_OG_TITLE = etree.XPath("//meta[@property='og:title']/@content")
+_TITLE_TEXT = etree.XPath("//title/text()")
+# Trailing " | Sacred Texts Archive" on page titles
+_SUFFIX = re.compile(r'\s*\|\s*Sacred Texts Archive\s*$')
+# Numbered book pages (fbe000.htm, fbe010a.htm, ...)
+_FBE = re.compile(r'^fbe\d{3}.*\.htm$')
+# Tags streamed out of each page while extracting its content. div is not a
+# content tag: wrapper divs would repeat every paragraph they contain
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_CONTENT_TAGS = _HEADING_TAGS | {'p', 'blockquote'}
+# Removed from the page, with everything inside them, before any content is
+# serialized; their trailing text is kept
+_DROP_TAGS = frozenset({'script', 'nav', 'style', 'hr'})
+_STREAM_TAGS = tuple(_CONTENT_TAGS | _DROP_TAGS) + ('center', 'meta')
+# A <center> holding none of these is a navigation block
+_CENTER_CONTENT_TAGS = frozenset({'h1', 'h2', 'h3', 'p'})
+_SKIP_TAGS = ('script', 'nav', 'style', 'head')
+
+# Book page, split around the chapter lists; only the header has substitutions
+_HEADER_TMPL = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{book_title} - The Forgotten Books of Eden</title>
+    <meta name="description" content="Read {book_title} from The Forgotten Books of Eden collection. Ancient sacred text in modern, readable format.">
+    <link rel="stylesheet" href="../css/style.css">
+</head>
+<body>
+    <header class="header">
+        <div class="container">
+            <h1>{book_title}</h1>
+            <p>From The Forgotten Books of Eden Collection</p>
+        </div>
+    </header>
+
+    <nav class="nav">
+        <div class="container">
+            <ul>
+                <li><a href="../index.html">Home</a></li>
+                <li><a href="../index.html#books">All Books</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <main class="main">
+        <div class="container">
+            <div class="reading-container">
+                <div class="chapter-nav">
+                    <select id="chapterSelect" class="chapter-select">
+                        <option value="">Select Chapter...</option>'''
+
+_CHAPTERS_OPEN = '''
+                    </select>
+                    <a href="../index.html" class="btn">← Back to Collection</a>
+                </div>
+
+                <div class="chapter-content">'''
+
+_FOOTER = '''
+                </div>
+            </div>
+        </div>
+    </main>
+
+    <footer class="footer">
+        <div class="container">
+            <p>&copy; 2024 The Forgotten Books of Eden - Digital Edition</p>
+            <p>Original text in the public domain. Modern presentation and formatting.</p>
+        </div>
+    </footer>
+
+    <script src="../js/script.js"></script>
+</body>
+</html>'''
+
+# Per-chapter fragments of the book page
+_OPTION_TMPL = '<option value="#{fn}">{title}</option>'
+_CHAPTER_TMPL = '''
+                    <div id="{fn}" class="chapter">
+                        {body}
+                    </div>'''
+
+def _write_if_changed(path, data):
+    """Write data (bytes) to path unless the file already holds exactly that."""
+    try:
+        # A size mismatch settles it without reading the old file
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    path.write_bytes(data)
+    return True
+
+# Bump when extract_clean_content's output changes so saved results are discarded
+_EXTRACT_CACHE_VERSION = 4
+
+def _load_extract_cache(path):
+    """Load extract_clean_content results saved by an earlier run, keyed by page hash."""
+    try:
+        version, entries = pickle.loads(path.read_bytes())
+    except Exception:
+        # Missing, truncated or foreign cache: start from scratch
+        return {}
+    
+    return entries if version == _EXTRACT_CACHE_VERSION else {}
+
+def _write_page(path, data):
+    """Write a site page plus precompressed .gz (and .br) copies for the preview server."""
+    _write_if_changed(path, data)
+    page_mtime = path.stat().st_mtime_ns
+    
+    # Refresh a companion whenever it is missing or older than the page; the
+    # other build scripts rewrite pages without touching their companions
+    gz_path = path.with_name(path.name + '.gz')
+    if _is_stale(gz_path, page_mtime):
+        # mtime=0 keeps the archive byte-stable across identical rebuilds
+        gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    
+    if brotli is not None:
+        br_path = path.with_name(path.name + '.br')
+        if _is_stale(br_path, page_mtime):
+            br_path.write_bytes(brotli.compress(data, quality=11))
+
+def _is_stale(path, source_mtime_ns):
+    """Whether path is missing or older than its source."""
+    try:
+        return path.stat().st_mtime_ns < source_mtime_ns
+    except FileNotFoundError:
+        return True
+
+def _page_title(content):
+    """Return a page's og:title (or <title>) without the archive suffix."""
+    tree = lxml_html.fromstring(content, parser=_HTML_PARSER)
+    title = (_OG_TITLE(tree) or _TITLE_TEXT(tree) or [''])[0]
+    return _SUFFIX.sub('', title)
+
+def _read_title(path):
+    """Read one source file and its title; runs in a worker process."""
+    try:
+        content = path.read_bytes()
+        return _page_title(content), content
+        
+    except Exception as e:
+        print(f"Error reading {path.name}: {e}")
+        return None, None
+
 def improve_website():
     """Improve the existing website by adding missing Adam and Eve books."""
     source_dir = Path('/home/otis/Documents/projects/christianresearch/sacred-texts')
     output_dir = Path('/home/otis/Documents/projects/christianresearch/website')
     
-    # Read a few Adam and Eve files to check content
+    # Cleaned chapters from earlier runs; pages whose bytes are unchanged
+    # skip extraction entirely
+    cache_path = source_dir.parent / '.fbe_cache.pkl'
+    extract_cache = _load_extract_cache(cache_path)
+    used_keys = set()
+    
+    # Read a few Adam and Eve files to check content, keeping each file's
+    # title and content so later passes don't read or parse it again
     adam_eve_files = []
     enoch_start = None
+    file_cache = {}
     
-    html_files = sorted([f for f in os.listdir(source_dir) if f.endswith('.htm') and f.startswith('fbe') and f[3:6].isdigit()])
+    html_files = sorted(e.name for e in os.scandir(source_dir) if _FBE.match(e.name))
     
-    for filename in html_files[5:]:  # Skip first 5 (title pages)
-        try:
-            with open(source_dir / filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            title_tag = soup.find('title')
-            og_title = soup.find('meta', property='og:title')
+    candidates = html_files[5:]  # Skip first 5 (title pages)
+    
+    # Titles are sniffed in worker processes; map() yields them in file
+    # order, so the scan can still stop at the first Enoch page
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_read_title, [source_dir / f for f in candidates], chunksize=8)
+        for filename, (title, content) in zip(candidates, results):
+            if title is None:
+                continue
             
-            title = ""
-            if og_title:
-                title = og_title.get('content', '').replace(' | Sacred Texts Archive', '')
-            elif title_tag:
-                title = title_tag.get_text().replace(' | Sacred Texts Archive', '')
+            file_cache[filename] = (title, content)
             
             print(f"{filename}: {title}")
             
             # Check for book transitions
-            if 'secrets of enoch' in title.lower() or 'book of the secrets' in title.lower():
+            lowered = title.lower()
+            if 'secrets of enoch' in lowered or 'book of the secrets' in lowered:
                 enoch_start = filename
+                # Files past Enoch are not needed; drop whatever is still queued
+                executor.shutdown(cancel_futures=True)
                 break
-            elif 'adam' in title.lower() and 'eve' in title.lower():
+            elif 'adam' in lowered and 'eve' in lowered:
                 adam_eve_files.append(filename)
-                
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
     
     print(f"\nFound {len(adam_eve_files)} Adam and Eve files")
     print(f"Enoch starts at: {enoch_start}")
@@ -56,51 +223,44 @@ def improve_website():
     
     current_book = "first"
     for filename in adam_eve_files:
-        try:
-            with open(source_dir / filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            title_tag = soup.find('title')
-            og_title = soup.find('meta', property='og:title')
-            
-            title = ""
-            if og_title:
-                title = og_title.get('content', '').replace(' | Sacred Texts Archive', '')
-            elif title_tag:
-                title = title_tag.get_text().replace(' | Sacred Texts Archive', '')
-            
-            if 'second book of adam' in title.lower():
-                current_book = "second"
-            
-            if current_book == "first":
-                first_book_files.append(filename)
-            else:
-                second_book_files.append(filename)
-                
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
+        title, _ = file_cache[filename]
+        
+        if 'second book of adam' in title.lower():
+            current_book = "second"
+        
+        if current_book == "first":
+            first_book_files.append(filename)
+        else:
+            second_book_files.append(filename)
     
     print(f"First Book of Adam and Eve: {len(first_book_files)} files")
     print(f"Second Book of Adam and Eve: {len(second_book_files)} files")
     
     # Create the Adam and Eve books
-    create_adam_eve_book("first_book_adam_eve", "The First Book of Adam and Eve", first_book_files, source_dir, output_dir)
-    create_adam_eve_book("second_book_adam_eve", "The Second Book of Adam and Eve", second_book_files, source_dir, output_dir)
+    create_adam_eve_book("first_book_adam_eve", "The First Book of Adam and Eve", first_book_files, file_cache, extract_cache, used_keys, output_dir)
+    create_adam_eve_book("second_book_adam_eve", "The Second Book of Adam and Eve", second_book_files, file_cache, extract_cache, used_keys, output_dir)
+    
+    # Save only this run's pages, so entries for edited or removed pages expire
+    # Filter in the cache's own order: set iteration follows the per-process
+    # hash seed and would change the pickle's bytes on every run
+    extract_cache = {key: value for key, value in extract_cache.items() if key in used_keys}
+    _write_if_changed(cache_path, pickle.dumps((_EXTRACT_CACHE_VERSION, extract_cache), protocol=pickle.HIGHEST_PROTOCOL))
     
     # Update the index page
     update_index_page(output_dir)
 
-def create_adam_eve_book(book_id, book_title, files, source_dir, output_dir):
-    """Create a book page for Adam and Eve."""
+def create_adam_eve_book(book_id, book_title, files, file_cache, extract_cache, used_keys, output_dir):
+    """Create a book page for Adam and Eve from the already-read source files."""
     chapters = []
     
     for filename in files:
         try:
-            with open(source_dir / filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            title, clean_html = extract_clean_content(content)
+            _, content = file_cache[filename]
+            key = hashlib.blake2b(content, digest_size=16).digest()
+            if key not in extract_cache:
+                extract_cache[key] = extract_clean_content(content)
+            title, clean_html = extract_cache[key]
+            used_keys.add(key)
             
             if title and clean_html:
                 chapters.append({
@@ -120,119 +280,121 @@ def create_adam_eve_book(book_id, book_title, files, source_dir, output_dir):
     create_book_html(book_id, book_title, chapters, output_dir)
     print(f"Created {book_title} with {len(chapters)} chapters")
 
+def _drop_element(element):
+    """Remove element and its subtree from the tree, keeping its tail text."""
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
 def extract_clean_content(html_content):
-    """Extract clean, readable content from HTML."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Remove all navigation, scripts, and metadata
-    for element in soup.find_all(['script', 'nav', 'style', 'head']):
-        element.decompose()
+    """Extract clean, readable content from raw UTF-8 encoded HTML."""
+    og_titles = []
+    headings = []
+    parts = []
+    # Slots in parts reserved by content elements still open, and for each
+    # open <center>: where its output starts and whether it holds content
+    open_slots = []
+    open_centers = []
     
-    # Find the main content body
-    body = soup.find('body')
-    if not body:
-        return "", ""
-    
-    # Remove navigation elements but keep content
-    for nav_element in body.find_all(['center', 'hr']):
-        # Keep center elements that contain actual content (headings, paragraphs)
-        if nav_element.name == 'center' and not (nav_element.find('h1') or nav_element.find('h2') or nav_element.find('h3') or nav_element.find('p')):
-            nav_element.decompose()
-        elif nav_element.name == 'hr':
-            nav_element.decompose()
+    # Stream the page rather than building the whole tree. Each content
+    # element reserves its place in document order when it opens and is
+    # serialized into it when it closes. Navigation, scripts and empty
+    # centers are removed as they close, so by then they are already gone
+    # from it; finished top-level content is freed
+    context = etree.iterparse(io.BytesIO(html_content), events=('start', 'end'),
+                              tag=_STREAM_TAGS, html=True, encoding='utf-8')
+    for event, element in context:
+        # Skip anything inside navigation, scripts, and metadata; this
+        # includes the og:title in <head>, so titles come from the headings
+        if next(element.iterancestors(*_SKIP_TAGS), None) is not None:
+            continue
+        
+        tag = element.tag
+        if tag in _DROP_TAGS:
+            if event == 'end':
+                _drop_element(element)
+            continue
+        
+        if tag == 'meta':
+            if event == 'end' and element.get('property') == 'og:title':
+                og_titles.append(element.get('content', ''))
+            continue
+        
+        # Centers without a heading or paragraph are navigation; drop them
+        # and everything they produced, headings included
+        if tag == 'center':
+            if event == 'start':
+                open_centers.append([len(parts), len(headings), len(og_titles), False])
+            else:
+                part_count, heading_count, og_count, has_content = open_centers.pop()
+                if not has_content:
+                    del parts[part_count:]
+                    del headings[heading_count:]
+                    del og_titles[og_count:]
+                    _drop_element(element)
+            continue
+        
+        if event == 'start':
+            if tag in _CENTER_CONTENT_TAGS:
+                for center in open_centers:
+                    center[3] = True
+            open_slots.append(len(parts))
+            parts.append(None)
+            continue
+        
+        slot = open_slots.pop()
+        # str.strip() rather than XPath normalize-space(), which only knows
+        # ASCII whitespace; em spaces and the like must count as blank too
+        text = ''.join(element.itertext()).strip()
+        if tag in _HEADING_TAGS:
+            headings.append(text)
+        
+        if text:
+            parts[slot] = etree.tostring(element, encoding='unicode', method='html', with_tail=False)
+        
+        # Nested content is serialized again as part of its enclosing element,
+        # so only release elements that have no content ancestor
+        if next(element.iterancestors(*_CONTENT_TAGS), None) is None:
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
     
-    # Extract title from first heading or meta tag
-    title = ""
-    og_title = soup.find('meta', property='og:title')
-    if og_title:
-        title = og_title.get('content', '').replace(' | Sacred Texts Archive', '')
+    # Fallback title: first heading that isn't the collection title
+    heading_title = ""
+    for heading_title in headings:
+        if heading_title and not heading_title.lower().startswith('the forgotten books'):
+            break
     
-    if not title:
-        for heading in body.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            title = heading.get_text().strip()
-            if title and not title.lower().startswith('the forgotten books'):
-                break
+    og_title = og_titles[0] if og_titles else ''
+    title = _SUFFIX.sub('', og_title) or heading_title
     
     # Convert to clean text while preserving structure
-    content_html = ""
-    for element in body.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'blockquote']):
-        if element.get_text().strip():
-            content_html += str(element) + "\n"
+    content_html = "".join(part + "\n" for part in parts if part)
     
     return title, content_html
 
 def create_book_html(book_id, book_title, chapters, output_dir):
     """Create HTML for a book."""
-    html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{book_title} - The Forgotten Books of Eden</title>
-    <meta name="description" content="Read {book_title} from The Forgotten Books of Eden collection. Ancient sacred text in modern, readable format.">
-    <link rel="stylesheet" href="../css/style.css">
-</head>
-<body>
-    <header class="header">
-        <div class="container">
-            <h1>{book_title}</h1>
-            <p>From The Forgotten Books of Eden Collection</p>
-        </div>
-    </header>
-
-    <nav class="nav">
-        <div class="container">
-            <ul>
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../index.html#books">All Books</a></li>
-            </ul>
-        </div>
-    </nav>
-
-    <main class="main">
-        <div class="container">
-            <div class="reading-container">
-                <div class="chapter-nav">
-                    <select id="chapterSelect" class="chapter-select">
-                        <option value="">Select Chapter...</option>'''
+    # Collect the page in pieces and join once at the end
+    parts = [_HEADER_TMPL.format(book_title=book_title)]
     
     # Add chapter options
-    for i, chapter in enumerate(chapters):
-        html_content += f'<option value="#{chapter["filename"]}">{chapter["title"]}</option>'
+    parts.extend(_OPTION_TMPL.format(fn=chapter['filename'], title=chapter['title']) for chapter in chapters)
     
-    html_content += '''
-                    </select>
-                    <a href="../index.html" class="btn">← Back to Collection</a>
-                </div>
-
-                <div class="chapter-content">'''
+    parts.append(_CHAPTERS_OPEN)
     
     # Add all chapters
-    for chapter in chapters:
-        html_content += f'''
-                    <div id="{chapter['filename']}" class="chapter">
-                        {chapter['content']}
-                    </div>'''
+    parts.extend(_CHAPTER_TMPL.format(fn=chapter['filename'], body=chapter['content']) for chapter in chapters)
     
-    html_content += '''
-                </div>
-            </div>
-        </div>
-    </main>
-
-    <footer class="footer">
-        <div class="container">
-            <p>&copy; 2024 The Forgotten Books of Eden - Digital Edition</p>
-            <p>Original text in the public domain. Modern presentation and formatting.</p>
-        </div>
-    </footer>
-
-    <script src="../js/script.js"></script>
-</body>
-</html>'''
+    parts.append(_FOOTER)
+    html_content = ''.join(parts)
     
-    with open(output_dir / 'books' / f'{book_id}.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    _write_page(output_dir / 'books' / f'{book_id}.html', html_content.encode('utf-8'))
 
 def update_index_page(output_dir):
     """Update the index page to include Adam and Eve books."""
@@ -367,8 +529,7 @@ def update_index_page(output_dir):
 </body>
 </html>'''
     
-    with open(output_dir / 'index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    _write_page(output_dir / 'index.html', html_content.encode('utf-8'))
 
 if __name__ == "__main__":
     improve_website()
\ No newline at end of file
@@ -5,58 +5,94 @@ Parse the Sacred Texts Archive HTML files to extract book structure and metadata
 
 import os
 import re
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html as lxml_html
 from pathlib import Path
-import json
+import orjson
+
+# Whitespace cleanup applied to every page's extracted text
+_RE_BLANKLINES = re.compile(r'\n\s*\n')
+_RE_HSPACE = re.compile(r'[ \t]+')
+# Trailing " | Sacred Texts Archive" on page titles
+_SUFFIX = re.compile(r'\s*\|\s*Sacred Texts Archive\s*$')
+# Source pages are UTF-8; read as bytes and decoded by libxml2
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+# First og:title meta of a page
+_OG_TITLE = etree.XPath("(//meta[@property='og:title'])[1]")
+# Everything stripped from a page body before taking its text: navigation,
+# centers without a heading or paragraph (nav bars), scripts and images, plus
+# the style, template and ruby-annotation text BeautifulSoup's get_text() skipped
+_STRIP_XP = etree.XPath("descendant::nav | descendant::center[not(.//h1 or .//h2 or .//p)]"
+                        " | descendant::script | descendant::img | descendant::style"
+                        " | descendant::template | descendant::rt | descendant::rp")
+
+def _write_if_changed(path, data):
+    """Write data (bytes) to path unless the file already holds exactly that."""
+    try:
+        # A size mismatch settles it without reading the old file
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    path.write_bytes(data)
+    return True
 
 def extract_book_info(html_content, filename):
-    """Extract title, chapter info, and content from HTML file."""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    """Extract title, chapter info, and text content from HTML file."""
+    try:
+        root = lxml_html.document_fromstring(html_content, parser=_HTML_PARSER)
+    except etree.ParserError:
+        # Empty page: nothing to extract
+        root = None
     
     # Extract title from meta tags or page title
     title = None
     
     # Try og:title first
-    og_title = soup.find('meta', property='og:title')
+    og_title = _OG_TITLE(root) if root is not None else None
     if og_title:
-        title = og_title.get('content', '').replace(' | Sacred Texts Archive', '')
+        title = _SUFFIX.sub('', og_title[0].get('content', ''))
     
     # Fall back to title tag
-    if not title:
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text().replace(' | Sacred Texts Archive', '')
+    if not title and root is not None:
+        title_tag = root.find('.//title')
+        if title_tag is not None:
+            title = _SUFFIX.sub('', title_tag.text_content())
     
     # Extract main content (remove navigation and metadata)
-    content_div = soup.find('body')
-    if content_div:
-        # Remove navigation elements
-        for nav in content_div.find_all(['nav', 'center']):
-            # Keep center tags that contain main content
-            if nav.name == 'center' and (nav.find('h1') or nav.find('h2') or nav.find('p')):
-                continue
-            nav.decompose()
-        
-        # Remove script tags and ads
-        for script in content_div.find_all(['script', 'img']):
-            script.decompose()
+    content_div = root.find('body') if root is not None else None
+    if content_div is not None:
+        # Empty out navigation, scripts and ads in one pass. The emptied
+        # elements stay in place so the text after each one is still its own
+        # line in the output
+        for element in _STRIP_XP(content_div):
+            element.clear(keep_tail=True)
         
         # Get clean text content
-        content = content_div.get_text(separator='\n', strip=True)
+        content = '\n'.join(text for text in (t.strip() for t in content_div.itertext()) if text)
         
         # Clean up excessive whitespace
-        content = re.sub(r'\n\s*\n', '\n\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
+        content = _RE_BLANKLINES.sub('\n\n', content)
+        content = _RE_HSPACE.sub(' ', content)
     else:
         content = ""
     
     return {
         'filename': filename,
         'title': title or filename,
-        'content': content,
-        'html': str(soup) if soup else html_content
+        'content': content
     }
 
+def _parse_one(path):
+    """Read and analyze a single HTML file; runs in a worker process."""
+    try:
+        return extract_book_info(path.read_bytes(), path.name)
+        
+    except Exception as e:
+        print(f"Error processing {path.name}: {e}")
+        return None
+
 def analyze_book_structure():
     """Analyze all HTML files to determine book structure."""
     sacred_texts_dir = Path('/home/otis/Documents/projects/christianresearch/sacred-texts')
@@ -65,22 +101,18 @@ def analyze_book_structure():
     file_info = []
     
     # Process all HTML files
-    html_files = sorted([f for f in os.listdir(sacred_texts_dir) if f.endswith('.htm')])
+    html_files = sorted(e.name for e in os.scandir(sacred_texts_dir) if e.name.endswith('.htm'))
     
-    for filename in html_files:
-        filepath = sacred_texts_dir / filename
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+    # Each file is parsed independently, so spread the CPU-bound parsing
+    # across processes; map() keeps the results in filename order
+    paths = [sacred_texts_dir / filename for filename in html_files]
+    with ProcessPoolExecutor() as executor:
+        for book_info in executor.map(_parse_one, paths, chunksize=8):
+            if book_info is None:
+                continue
             
-            book_info = extract_book_info(content, filename)
             file_info.append(book_info)
-            
-            print(f"Processed: {filename} - {book_info['title'][:60]}...")
-            
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
+            print(f"Processed: {book_info['filename']} - {book_info['title'][:60]}...")
     
     # Group files by book based on titles and content
     # The main book appears to be "The Forgotten Books of Eden"
@@ -100,12 +132,11 @@ def analyze_book_structure():
     
     # Save the analysis
     analysis_file = sacred_texts_dir.parent / 'book_analysis.json'
-    with open(analysis_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'main_book': main_book,
-            'total_files': len(file_info),
-            'file_details': file_info
-        }, f, indent=2, ensure_ascii=False)
+    _write_if_changed(analysis_file, orjson.dumps({
+        'main_book': main_book,
+        'total_files': len(file_info),
+        'file_details': file_info
+    }, option=orjson.OPT_INDENT_2))
     
     print(f"\nAnalysis complete!")
     print(f"Total files processed: {len(file_info)}")
@@ -3,12 +3,139 @@
 Simple HTTP server to preview The Forgotten Books of Eden website locally.
 """
 
+import datetime
+import email.utils
+import functools
+import gzip
 import http.server
-import socketserver
+import io
 import webbrowser
 import os
 from pathlib import Path
 
+# Text assets worth compressing for the browser
+_COMPRESSIBLE = frozenset({'.html', '.css', '.js'})
+# Companion files written at build time, in order of preference
+_PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+@functools.lru_cache(maxsize=64)
+def _gzipped(path, mtime_ns):
+    """Gzip a file's contents; keyed on mtime so edits are picked up."""
+    with open(path, 'rb') as f:
+        return gzip.compress(f.read(), compresslevel=6)
+
+def _encoding_allowed(accept_encoding, coding):
+    """Whether an Accept-Encoding header allows coding, honouring q-values."""
+    if not accept_encoding:
+        return False
+    
+    wildcard = False
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        
+        # An explicit entry for the coding wins over the * wildcard
+        if name == coding:
+            return quality > 0
+        if name == '*':
+            wildcard = quality > 0
+    
+    return wildcard
+
+class PreviewHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with keep-alive and gzip for text assets."""
+    
+    # HTTP/1.1 keeps connections open between requests; every response
+    # below carries a Content-Length, which that requires
+    protocol_version = 'HTTP/1.1'
+    # Resolve the script's type up front instead of through the platform
+    # mimetypes database on every request
+    extensions_map = {**http.server.SimpleHTTPRequestHandler.extensions_map,
+                      '.js': 'application/javascript'}
+    
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        
+        # Anything else (directories, redirects, errors, binary files) is
+        # left to the stock handler
+        if os.path.splitext(path)[1] not in _COMPRESSIBLE or not os.path.isfile(path):
+            return super().send_head()
+        
+        accepted = self.headers.get('Accept-Encoding', '')
+        stat = os.stat(path)
+        mtime = stat.st_mtime_ns
+        
+        if self._not_modified(stat.st_mtime):
+            return None
+        
+        # Prefer a companion compressed at build time, unless the page has
+        # been rewritten since (e.g. by another build script)
+        for encoding, suffix in _PRECOMPRESSED:
+            if not _encoding_allowed(accepted, encoding):
+                continue
+            try:
+                companion = os.stat(path + suffix)
+            except FileNotFoundError:
+                continue
+            if companion.st_mtime_ns >= mtime:
+                f = open(path + suffix, 'rb')
+                self._send_encoded_headers(path, encoding, companion.st_size, mtime)
+                return f
+        
+        if not _encoding_allowed(accepted, 'gzip'):
+            return super().send_head()
+        
+        body = _gzipped(path, mtime)
+        self._send_encoded_headers(path, 'gzip', len(body), mtime)
+        return io.BytesIO(body)
+    
+    def _not_modified(self, mtime):
+        """Answer 304 if the client's copy is current, as the stock send_head does."""
+        if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+            return False
+        
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            # Ill-formed dates are ignored
+            return False
+        
+        if ims.tzinfo is None:
+            # Obsolete format with no timezone, cf. RFC 7231 section 7.1.1.1
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        if ims.tzinfo is not datetime.timezone.utc:
+            return False
+        
+        # If-Modified-Since has whole-second resolution
+        last_modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc).replace(microsecond=0)
+        if last_modified > ims:
+            return False
+        
+        self.send_response(304)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        return True
+    
+    def _send_encoded_headers(self, path, encoding, length, mtime):
+        """Start a 200 response for a compressed copy of path."""
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(length))
+        self.send_header('Last-Modified', self.date_time_string(mtime // 1_000_000_000))
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+
 def serve_website():
     """Serve the website locally for preview."""
     website_dir = Path('/home/otis/Documents/projects/christianresearch/website')
@@ -21,10 +148,11 @@ def serve_website():
     os.chdir(website_dir)
     
     PORT = 8000
-    Handler = http.server.SimpleHTTPRequestHandler
+    Handler = PreviewHandler
     
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        # One thread per request, so the page's CSS and JS load in parallel
+        with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
             print(f"🌐 Serving The Forgotten Books of Eden at http://localhost:{PORT}")
             print(f"📁 Serving from: {website_dir}")
             print(f"📚 Available books:")